@@ -0,0 +1,2 @@
+# Root conftest so pytest puts the repository root on sys.path, letting the
+# tests import src.process regardless of how pytest is invoked.
@@ -11,6 +11,7 @@ import sys
 import base64
 import json
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from getpass import getpass
 from urllib.parse import quote_plus
 
@@ -22,6 +23,28 @@ except Exception:
 
 API_BASE = "https://api.github.com"
 
+def _make_session():
+    """
+    Shared Session for all GitHub API calls: pools connections so the TCP+TLS
+    handshake is paid once, and retries 429/5xx with backoff (honouring
+    Retry-After). Authorization is passed per call, never stored on the session.
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    session.headers.update({"Accept": "application/vnd.github.v3+json", "User-Agent": "colab-github-bridge"})
+    return session
+
+_SESSION = _make_session()
+
 def get_token():
     token = os.environ.get("GITHUB_TOKEN")
     if token:
@@ -32,34 +55,84 @@ def get_token():
     except Exception:
         return None
 
+# In-process ETag cache for conditional GETs, keyed by (owner, repo, path, branch).
+# GitHub answers a matching If-None-Match with a bodyless 304 that does not
+# count against the authenticated rate limit, so idempotent notebook reruns
+# stop burning the 5000/hr budget.
+_ETAG_CACHE = {}
+
 def file_exists(owner, repo, path, branch, headers):
     url = f"{API_BASE}/repos/{owner}/{repo}/contents/{quote_plus(path)}"
     params = {"ref": branch} if branch else {}
-    r = requests.get(url, headers=headers, params=params)
+    cache_key = (owner, repo, path, branch)
+    cached = _ETAG_CACHE.get(cache_key)
+    if cached:
+        headers = dict(headers)
+        headers["If-None-Match"] = cached[0]
+    r = _SESSION.get(url, headers=headers, params=params)
+    if r.status_code == 304:
+        return cached[1]
     if r.status_code == 200:
-        return r.json()  # returns dict with 'sha' etc.
+        data = r.json()  # returns dict with 'sha' etc.
+        etag = r.headers.get("ETag")
+        if etag:
+            _ETAG_CACHE[cache_key] = (etag, data)
+        return data
     if r.status_code == 404:
+        _ETAG_CACHE.pop(cache_key, None)
         return None
     r.raise_for_status()
 
-def create_or_update_file(owner, repo, path, content_bytes, message, branch, force_update=False):
-    token = get_token()
+def _is_utf8_text(content_bytes):
+    try:
+        content_bytes.decode("utf-8")
+        return True
+    except UnicodeDecodeError:
+        return False
+
+def create_or_update_file(owner, repo, path, content_bytes, message, branch, force_update=False, token=None):
+    """
+    Create or update a single file and return a dict with 'content' and
+    'commit' keys, as the Contents API PUT responds. Text content on an
+    explicit branch is committed through the Git Data API instead (smaller,
+    base64-free upload); on that path 'content' is None since the Data API
+    returns no content metadata. All API failures raise SystemExit with a
+    "GitHub API error (...)" message regardless of path.
+    """
+    if token is None:
+        token = get_token()
     if not token:
         raise SystemExit("No GitHub token provided.")
     headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
+
+    existing = file_exists(owner, repo, path, branch, headers)
+    if existing and not force_update:
+        raise SystemExit(f"File already exists at {path} on branch {branch or 'default'}. Use --force to update.")
+
+    # Text content on an explicit branch goes through the Git Data API,
+    # where blobs upload as raw UTF-8: base64 inflates the request body by a
+    # third and costs an O(n) Python-side encode. Binary content and
+    # default-branch writes keep the Contents API path below.
+    if branch and _is_utf8_text(content_bytes):
+        try:
+            commit = create_or_update_files(owner, repo, [(path, content_bytes)], message, branch, token=token)
+        except requests.HTTPError as e:
+            try:
+                err = e.response.json()
+            except Exception:
+                err = e.response.text
+            raise SystemExit(f"GitHub API error ({e.response.status_code}): {err}")
+        return {"content": None, "commit": commit}
+
     url = f"{API_BASE}/repos/{owner}/{repo}/contents/{quote_plus(path)}"
     encoded = base64.b64encode(content_bytes).decode("ascii")
     payload = {"message": message, "content": encoded}
     if branch:
         payload["branch"] = branch
-
-    existing = file_exists(owner, repo, path, branch, headers)
     if existing:
-        if not force_update:
-            raise SystemExit(f"File already exists at {path} on branch {branch or 'default'}. Use --force to update.")
         payload["sha"] = existing.get("sha")
 
-    r = requests.put(url, headers=headers, data=json.dumps(payload))
+    r = _SESSION.put(url, headers=headers, json=payload)
     if r.status_code in (200, 201):
         return r.json()
     else:
@@ -70,6 +143,134 @@ def create_or_update_file(owner, repo, path, content_bytes, message, branch, for
             err = r.text
         raise SystemExit(f"GitHub API error ({r.status_code}): {err}")
 
+def _create_blob(repo_base, headers, content_bytes):
+    """
+    POST a single blob and return its SHA. Valid UTF-8 content is sent raw
+    with encoding=utf-8, avoiding base64's 33% size overhead and the extra
+    encode pass; anything else falls back to base64.
+    """
+    if _is_utf8_text(content_bytes):
+        payload = {"content": content_bytes.decode("utf-8"), "encoding": "utf-8"}
+    else:
+        payload = {"content": base64.b64encode(content_bytes).decode("ascii"), "encoding": "base64"}
+    r = _SESSION.post(f"{repo_base}/git/blobs", headers=headers, json=payload)
+    r.raise_for_status()
+    return r.json()["sha"]
+
+def create_or_update_files(owner, repo, files, message, branch, token=None):
+    """
+    Commit several files to `branch` as one atomic commit via the Git Data API.
+
+    `files` is a list of (path, content_bytes) tuples. Calling
+    create_or_update_file per file costs one GET plus one PUT each and
+    produces k separate commits; this costs four fixed calls plus one blob
+    POST per file and produces a single commit:
+      1. resolve the branch tip commit and its tree
+      2. POST each file as a blob
+      3. POST one tree layered on the base tree
+      4. POST one commit with the branch tip as parent
+      5. PATCH the branch ref to the new commit
+    Returns the JSON of the created commit.
+    """
+    if token is None:
+        token = get_token()
+    if not token:
+        raise SystemExit("No GitHub token provided.")
+    headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
+    repo_base = f"{API_BASE}/repos/{owner}/{repo}"
+
+    r = _SESSION.get(f"{repo_base}/git/ref/heads/{branch}", headers=headers)
+    r.raise_for_status()
+    base_sha = r.json()["object"]["sha"]
+    r = _SESSION.get(f"{repo_base}/git/commits/{base_sha}", headers=headers)
+    r.raise_for_status()
+    base_tree = r.json()["tree"]["sha"]
+
+    # Blob uploads are independent of each other, so issue them concurrently
+    # over the pooled session; only the tree/commit/ref steps are ordered.
+    # The push-then-PR flow elsewhere stays serial: the PR requires the
+    # branch to exist on origin first.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        blob_shas = list(pool.map(lambda f: _create_blob(repo_base, headers, f[1]), files))
+    tree_entries = [
+        {"path": path, "mode": "100644", "type": "blob", "sha": blob_sha}
+        for (path, _), blob_sha in zip(files, blob_shas)
+    ]
+
+    r = _SESSION.post(f"{repo_base}/git/trees", headers=headers, json={"base_tree": base_tree, "tree": tree_entries})
+    r.raise_for_status()
+    tree_sha = r.json()["sha"]
+
+    r = _SESSION.post(f"{repo_base}/git/commits", headers=headers, json={"message": message, "tree": tree_sha, "parents": [base_sha]})
+    r.raise_for_status()
+    commit = r.json()
+
+    r = _SESSION.patch(f"{repo_base}/git/refs/heads/{branch}", headers=headers, json={"sha": commit["sha"]})
+    r.raise_for_status()
+    return commit
+
+class RepoTreeIndex:
+    """
+    In-memory index of a repository tree for read-heavy Contents API
+    workflows. Reading k files via the Contents API costs k calls; one
+    recursive tree fetch returns every path/SHA pair at once, after which
+    lookups are dict hits and only the blobs actually read cost a request
+    (memoized per SHA).
+
+    Usage:
+        index = RepoTreeIndex(owner, repo, branch="main", token=token)
+        if "notes/from-colab.txt" in index:
+            data = index.get_blob("notes/from-colab.txt")
+    """
+
+    def __init__(self, owner, repo, branch=None, token=None):
+        self.owner = owner
+        self.repo = repo
+        self.branch = branch or "main"
+        if token is None:
+            token = get_token()
+        if not token:
+            raise SystemExit("No GitHub token provided.")
+        self._headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
+        self._repo_base = f"{API_BASE}/repos/{owner}/{repo}"
+        self._paths = None  # {path: blob sha}, fetched on first use
+        self._blobs = {}  # {sha: content bytes}
+
+    def _tree(self):
+        if self._paths is None:
+            r = _SESSION.get(f"{self._repo_base}/git/ref/heads/{self.branch}", headers=self._headers)
+            r.raise_for_status()
+            tip_sha = r.json()["object"]["sha"]
+            r = _SESSION.get(f"{self._repo_base}/git/trees/{tip_sha}", headers=self._headers, params={"recursive": "1"})
+            r.raise_for_status()
+            self._paths = {entry["path"]: entry["sha"] for entry in r.json()["tree"] if entry["type"] == "blob"}
+        return self._paths
+
+    def __contains__(self, path):
+        return path in self._tree()
+
+    def paths(self):
+        """Return all blob paths in the tree."""
+        return list(self._tree())
+
+    def get_sha(self, path):
+        """Return the blob SHA for `path`, or None if the path is not a blob."""
+        return self._tree().get(path)
+
+    def get_blob(self, path):
+        """
+        Return the decoded content bytes of the blob at `path`.
+        Raises KeyError if the path is not in the tree.
+        """
+        sha = self._tree().get(path)
+        if sha is None:
+            raise KeyError(path)
+        if sha not in self._blobs:
+            r = _SESSION.get(f"{self._repo_base}/git/blobs/{sha}", headers=self._headers)
+            r.raise_for_status()
+            self._blobs[sha] = base64.b64decode(r.json()["content"])
+        return self._blobs[sha]
+
 def main(argv):
     p = argparse.ArgumentParser()
     p.add_argument("--owner", required=True, help="GitHub owner or org")
@@ -13,7 +13,8 @@ Behavior:
 """
 
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional
 import sys
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -22,14 +23,14 @@ INPUT_FILE = DATA_DIR / "input.txt"
 OUTPUT_FILE = DATA_DIR / "output.txt"
 
 
-def ensure_data_dir():
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+def ensure_data_dir(data_dir: Path = DATA_DIR) -> None:
+    data_dir.mkdir(parents=True, exist_ok=True)
 
 
-def read_input() -> list:
-    if not INPUT_FILE.exists():
+def read_input(input_file: Path = INPUT_FILE) -> list:
+    if not input_file.exists():
         return []
-    with INPUT_FILE.open("r", encoding="utf-8") as f:
+    with input_file.open("r", encoding="utf-8") as f:
         return [line.rstrip("\n") for line in f]
 
 
@@ -38,9 +39,9 @@ def transform(lines: list) -> list:
     return [line.upper() for line in lines if line.strip() != ""]
 
 
-def write_output(transformed: list) -> None:
-    now = datetime.utcnow().isoformat() + "Z"
-    with OUTPUT_FILE.open("w", encoding="utf-8") as f:
+def write_output(transformed: list, output_file: Path = OUTPUT_FILE) -> None:
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    with output_file.open("w", encoding="utf-8") as f:
         f.write(f"# Generated at {now}\n")
         if transformed:
             f.write("\n".join(transformed) + "\n")
@@ -48,13 +49,57 @@ def write_output(transformed: list) -> None:
             f.write("NO_INPUT\n")
 
 
-def main() -> int:
+def _upper_line(line: bytes) -> bytes:
+    # bytes.upper is a tight C loop over the ASCII table; only non-ASCII
+    # lines pay for a round-trip through the full Unicode case mapping.
+    if line.isascii():
+        return line.upper()
+    return line.decode("utf-8").upper().encode("utf-8")
+
+
+def process_stream(input_file: Path = INPUT_FILE, output_file: Path = OUTPUT_FILE) -> int:
+    """
+    Stream the input file through the transformation line by line, writing
+    each transformed line as it is produced. Unlike the
+    read_input/transform/write_output trio (kept for callers that want the
+    pieces), this holds only one line in memory at a time, so memory stays
+    O(1) regardless of input size. I/O is binary with an ASCII fast path:
+    uppercasing happens on bytes, skipping per-line UTF-8 decode/encode for
+    the common all-ASCII input. Returns the number of lines written.
+    """
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    count = 0
+    with output_file.open("wb", buffering=1 << 20) as fout:
+        fout.write(f"# Generated at {now}\n".encode("utf-8"))
+        if input_file.exists():
+            with input_file.open("rb", buffering=1 << 20) as fin:
+                for line in fin:
+                    # Binary reads skip universal newlines, so strip \r\n
+                    # explicitly to match the old text-mode behaviour.
+                    stripped = line.rstrip(b"\r\n")
+                    if stripped.strip():
+                        fout.write(_upper_line(stripped))
+                        fout.write(b"\n")
+                        count += 1
+        if count == 0:
+            fout.write(b"NO_INPUT\n")
+    return count
+
+
+def main(root: Optional[Path] = None) -> int:
+    """
+    Run the processing step. By default paths are resolved relative to the
+    repository containing this file; tests (and other embedders) can pass an
+    explicit `root` to operate on a different workspace without spawning a
+    fresh interpreter.
+    """
+    data_dir = (Path(root) / "data") if root is not None else DATA_DIR
+    input_file = data_dir / "input.txt"
+    output_file = data_dir / "output.txt"
     try:
-        ensure_data_dir()
-        lines = read_input()
-        transformed = transform(lines)
-        write_output(transformed)
-        print(f"Wrote {OUTPUT_FILE} (lines: {len(transformed)})")
+        ensure_data_dir(data_dir)
+        count = process_stream(input_file, output_file)
+        print(f"Wrote {output_file} (lines: {count})")
         return 0
     except Exception as e:
         print(f"Error in process.py: {e}", file=sys.stderr)
@@ -3,25 +3,20 @@ tests/test_process.py
 
 Unit tests for src/process.py using pytest.
 
-These tests run the processing script in a temporary repository workspace,
-create an input file, execute the script as a subprocess, and assert that
-the expected output file is created with the correct transformed content.
+The behavioural tests call src.process.main(root=...) in-process against a
+temporary workspace: spawning a fresh interpreter per test costs hundreds of
+milliseconds of startup, which dominated this suite's runtime. One
+subprocess-based smoke test remains to cover the `python -m src.process`
+command-line entry point.
 """
 
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 import textwrap
 
-
-def run_process_in_dir(work_dir: Path) -> subprocess.CompletedProcess:
-    """
-    Run the processing script as a module in the given working directory.
-    Returns the CompletedProcess result.
-    """
-    # Use -m to run the package module so imports resolve correctly
-    cmd = [sys.executable, "-m", "src.process"]
-    return subprocess.run(cmd, cwd=str(work_dir), capture_output=True, text=True)
+from src.process import main
 
 
 def test_process_creates_output(tmp_path: Path):
@@ -44,11 +39,11 @@ def test_process_creates_output(tmp_path: Path):
     )
     (data_dir / "input.txt").write_text(input_text, encoding="utf-8")
 
-    # Act: run the process script
-    result = run_process_in_dir(repo_root)
+    # Act: run the processing step in-process against the temp workspace
+    returncode = main(root=repo_root)
 
-    # Assert: script exited successfully
-    assert result.returncode == 0, f"process.py failed: stdout={result.stdout} stderr={result.stderr}"
+    # Assert: processing succeeded
+    assert returncode == 0
 
     output_file = data_dir / "output.txt"
     assert output_file.exists(), "Expected data/output.txt to be created"
@@ -80,8 +75,8 @@ def test_process_handles_no_input(tmp_path: Path):
     if input_file.exists():
         input_file.unlink()
 
-    result = run_process_in_dir(repo_root)
-    assert result.returncode == 0, f"process.py failed: stdout={result.stdout} stderr={result.stderr}"
+    returncode = main(root=repo_root)
+    assert returncode == 0
 
     output_file = data_dir / "output.txt"
     assert output_file.exists(), "Expected data/output.txt to be created when no input exists"
@@ -90,3 +85,29 @@ def test_process_handles_no_input(tmp_path: Path):
     assert content[0].startswith("# Generated at "), "Output header missing or malformed"
     # After header, the file should contain the sentinel NO_INPUT
     assert any("NO_INPUT" in line for line in content[1:]), "Expected 'NO_INPUT' in output when no input provided"
+
+
+def test_process_cli_smoke(tmp_path: Path):
+    """
+    Smoke test for the `python -m src.process` entry point: copy the package
+    into a temporary workspace, run it as a subprocess, and assert that the
+    output file is created there.
+    """
+    repo_root = tmp_path
+    src_dir = Path(__file__).resolve().parent.parent / "src"
+    shutil.copytree(src_dir, repo_root / "src", ignore=shutil.ignore_patterns("__pycache__"))
+    data_dir = repo_root / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    (data_dir / "input.txt").write_text("hello cli\n", encoding="utf-8")
+
+    result = subprocess.run(
+        [sys.executable, "-m", "src.process"],
+        cwd=str(repo_root),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, f"process.py failed: stdout={result.stdout} stderr={result.stderr}"
+
+    content = (data_dir / "output.txt").read_text(encoding="utf-8").splitlines()
+    assert content[0].startswith("# Generated at ")
+    assert content[1] == "HELLO CLI"